@@ -4,47 +4,184 @@ Video Voice Changer Script
 Processes recorded videos to change voice using ElevenLabs AI
 """
 
+import bisect
+import functools
 import os
+import re
+import shutil
 import sys
 import subprocess
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import argparse
 from typing import Optional
 
-# Load environment variables from .env file
+# orjson parses ffprobe output several times faster than stdlib json;
+# purely optional, matters when probing many files in a batch
 try:
-    from dotenv import load_dotenv
-    load_dotenv()
-    DOTENV_AVAILABLE = True
+    from orjson import loads as _json_loads
 except ImportError:
-    DOTENV_AVAILABLE = False
-    print("Warning: python-dotenv not installed. Install with: pip install python-dotenv")
+    from json import loads as _json_loads
+
+def _load_dotenv_if_needed():
+    """Load .env for the API key, but only when it isn't already set.
+
+    Skipping dotenv when the environment already has a key keeps CLI
+    cold-start (e.g. --help) free of the import and file scan.
+    """
+    if os.getenv("ELEVEN_LABS_KEY") or os.getenv("ELEVENLABS_API_KEY"):
+        return
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        print("Warning: python-dotenv not installed. Install with: pip install python-dotenv")
+
+
+# elevenlabs drags in pydantic/httpx/websockets, hundreds of ms of import
+# time, so defer it until a TTS call actually needs it.
+# None = not tried yet, False = unavailable, otherwise the module.
+_elevenlabs_module = None
+
+
+def _ensure_elevenlabs():
+    """Import elevenlabs on first use. Returns the module or None."""
+    global _elevenlabs_module
+    if _elevenlabs_module is None:
+        try:
+            import elevenlabs
+            _elevenlabs_module = elevenlabs
+        except ImportError:
+            _elevenlabs_module = False
+            print("Warning: elevenlabs package not installed. Install with: pip install elevenlabs")
+    return _elevenlabs_module or None
+
+
+# Whisper backends resolved once per process, same shape as the elevenlabs
+# guard above: None = not tried, False = unavailable, else the module.
+_faster_whisper_module = None
+_openai_whisper_module = None
+
+
+def _ensure_faster_whisper():
+    """Import faster_whisper on first use. Returns the module or None."""
+    global _faster_whisper_module
+    if _faster_whisper_module is None:
+        try:
+            import faster_whisper
+            _faster_whisper_module = faster_whisper
+        except ImportError:
+            _faster_whisper_module = False
+    return _faster_whisper_module or None
+
+
+def _ensure_openai_whisper():
+    """Import whisper on first use. Returns the module or None."""
+    global _openai_whisper_module
+    if _openai_whisper_module is None:
+        try:
+            import whisper
+            _openai_whisper_module = whisper
+        except ImportError:
+            _openai_whisper_module = False
+    return _openai_whisper_module or None
+
+
+def _run(cmd) -> subprocess.CompletedProcess:
+    """Run a command capturing output through a 1 MB pipe buffer.
+
+    ffmpeg can emit megabytes of stderr on long encodes; the enlarged
+    buffer cuts the read syscall count versus the default pipe size.
+    """
+    return subprocess.run(cmd, capture_output=True, text=True, bufsize=1 << 20)
+
+
+@functools.lru_cache(maxsize=32)
+def _ffprobe(media_path: str, mtime: float) -> Optional[dict]:
+    """Run ffprobe once for a file, returning parsed format + stream info.
+
+    Memoized on (path, mtime) so the several duration/info lookups made
+    while processing one video cost a single fork instead of one each.
+    """
+    try:
+        cmd = [
+            'ffprobe', '-v', 'quiet', '-print_format', 'json',
+            '-show_format', '-show_streams', media_path
+        ]
+        result = _run(cmd)
+        if result.returncode == 0:
+            return _json_loads(result.stdout)
+    except Exception:
+        pass
+    return None
+
+
+# Matches punctuation that should be followed by an SSML break. One precompiled
+# pattern with alternation so pause insertion is a single pass over the text
+# instead of one re.sub traversal per punctuation class.
+_PAUSE_RE = re.compile(r'([.!?])\s+|(,)\s+|([;:])\s+')
+
+# Inter-segment gap buckets for _segment_gap_breaks: a gap is classified by
+# where it lands among the thresholds, then mapped straight to a fragment.
+# None marks the top bucket, whose break is interpolated from the actual gap.
+_GAP_THRESHOLDS = (0.3, 1.0, 2.0)
+_GAP_BREAKS = (' ', ' <break time="0.4s"/> ', ' <break time="0.8s"/> ', None)
+# ElevenLabs ignores break tags much past 3 seconds
+_GAP_BREAK_MAX = 3.0
+
+
+def _insert_breaks(text: str, sentence: str, comma: str, semi: str) -> str:
+    """Insert SSML break tags after punctuation in a single regex pass."""
+    def _sub(match):
+        if match.group(1):
+            return f'{match.group(1)} <break time="{sentence}"/> '
+        if match.group(2):
+            return f'{match.group(2)} <break time="{comma}"/> '
+        return f'{match.group(3)} <break time="{semi}"/> '
+    return _PAUSE_RE.sub(_sub, text)
 
-try:
-    from elevenlabs import generate, set_api_key, voices
-    ELEVENLABS_AVAILABLE = True
-except ImportError:
-    ELEVENLABS_AVAILABLE = False
-    print("Warning: elevenlabs package not installed. Install with: pip install elevenlabs")
 
 class VideoVoiceChanger:
-    def __init__(self, elevenlabs_api_key: Optional[str] = None):
+    # Cache of loaded Whisper models, shared across instances and calls.
+    # Keyed by (backend, model_size, compute_type) so repeated process_video
+    # calls don't pay the multi-second model init every time.
+    _whisper_models = {}
+
+    # Best available H.264 encoder, probed once per process.
+    _h264_encoder = None
+
+    def __init__(self, elevenlabs_api_key: Optional[str] = None,
+                 whisper_model_size: str = "distil-large-v3", beam_size: int = 1,
+                 compute_type: Optional[str] = None):
         """Initialize the voice changer with ElevenLabs API key."""
+        self.whisper_model_size = whisper_model_size
+        self.beam_size = beam_size
+        self.compute_type = compute_type
+
         # Try to get API key from multiple sources
         if elevenlabs_api_key is None:
+            _load_dotenv_if_needed()
             # First try ELEVEN_LABS_KEY from .env file
             elevenlabs_api_key = os.getenv("ELEVEN_LABS_KEY")
             # Fallback to ELEVENLABS_API_KEY for backward compatibility
             if elevenlabs_api_key is None:
                 elevenlabs_api_key = os.getenv("ELEVENLABS_API_KEY")
-        
+
         self.elevenlabs_api_key = elevenlabs_api_key
-        if elevenlabs_api_key and ELEVENLABS_AVAILABLE:
-            set_api_key(elevenlabs_api_key)
-        
+        self._api_key_applied = False
+
         # Check for required tools
         self._check_dependencies()
+
+    def _get_elevenlabs(self):
+        """Get the lazily imported elevenlabs module, applying the API key once."""
+        module = _ensure_elevenlabs()
+        if module and self.elevenlabs_api_key and not self._api_key_applied:
+            module.set_api_key(self.elevenlabs_api_key)
+            self._api_key_applied = True
+        return module
     
     def _check_dependencies(self):
         """Check if required tools are installed."""
@@ -62,28 +199,31 @@ class VideoVoiceChanger:
     
     def _command_exists(self, command: str) -> bool:
         """Check if a command exists in the system PATH."""
-        try:
-            subprocess.run(['which', command], check=True, capture_output=True)
-            return True
-        except subprocess.CalledProcessError:
-            return False
+        return shutil.which(command) is not None
     
     def extract_audio(self, video_path: str, audio_path: str) -> bool:
         """Extract audio from video file."""
         try:
+            # Whisper works on 16 kHz mono internally, so extract straight to
+            # that format instead of 44.1 kHz stereo it would resample anyway
             cmd = [
-                'ffmpeg', '-i', video_path,
-                '-vn',  # No video
+                'ffmpeg', '-threads', '0', '-loglevel', 'error',
+                '-fflags', '+fastseek', '-i', video_path,
+                '-map', '0:a:0?',  # First audio stream only
+                '-vn', '-dn', '-sn',  # Skip video/data/subtitle streams
                 '-acodec', 'pcm_s16le',  # Uncompressed audio
-                '-ar', '44100',  # Sample rate
-                '-ac', '2',  # Stereo
+                '-ar', '16000',  # Whisper's native sample rate
+                '-ac', '1',  # Mono
                 '-y',  # Overwrite output file
                 audio_path
             ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                print(f"Error extracting audio: {result.stderr}")
+
+            # Only stderr is buffered (for error reporting); stdout is unused
+            proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.PIPE, bufsize=1 << 20)
+            _, stderr = proc.communicate()
+            if proc.returncode != 0:
+                print(f"Error extracting audio: {stderr.decode(errors='replace')}")
                 return False
             
             print(f"Audio extracted to: {audio_path}")
@@ -93,34 +233,202 @@ class VideoVoiceChanger:
             print(f"Error extracting audio: {e}")
             return False
     
-    def transcribe_audio(self, audio_path: str) -> Optional[dict]:
-        """Transcribe audio to text with timing information using whisper."""
-        # Try faster-whisper first (more compatible)
+    def _resolve_device_and_compute(self) -> tuple:
+        """Pick the transcription device and compute type.
+
+        Uses CUDA with int8_float16 quantization when a GPU is visible,
+        otherwise int8 on CPU. An explicit compute_type always wins.
+        """
+        device = "cpu"
         try:
-            from faster_whisper import WhisperModel
-            
-            print("Using faster-whisper for transcription...")
-            model = WhisperModel("base", device="cpu", compute_type="int8")
-            segments, info = model.transcribe(audio_path, beam_size=5)
-            
-            transcript_data = {
-                'full_text': '',
-                'segments': [],
-                'total_duration': 0
+            import torch
+            if torch.cuda.is_available():
+                device = "cuda"
+        except ImportError:
+            pass
+
+        compute_type = self.compute_type
+        if compute_type is None:
+            compute_type = "int8_float16" if device == "cuda" else "int8"
+
+        return device, compute_type
+
+    def _get_whisper_model(self, backend: str, model_size: str):
+        """Get a cached Whisper model, loading it on first use."""
+        device, compute_type = self._resolve_device_and_compute()
+        cache_key = (backend, model_size, device, compute_type)
+        model = self._whisper_models.get(cache_key)
+        if model is None:
+            if backend == 'faster-whisper':
+                faster_whisper = _ensure_faster_whisper()
+                if faster_whisper is None:
+                    raise ImportError("faster-whisper is not installed")
+                model = faster_whisper.WhisperModel(model_size, device=device, compute_type=compute_type)
+            else:
+                whisper = _ensure_openai_whisper()
+                if whisper is None:
+                    raise ImportError("openai-whisper is not installed")
+                model = whisper.load_model(model_size)
+            self._whisper_models[cache_key] = model
+        return model
+
+    def extract_audio_array(self, video_path: str):
+        """Extract audio as a 16 kHz mono float32 numpy array via an ffmpeg pipe.
+
+        Streams raw PCM from ffmpeg stdout straight into memory, skipping the
+        intermediate WAV file and its decode round-trip. Returns None if numpy
+        is unavailable or extraction fails (callers fall back to extract_audio).
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            return None
+
+        try:
+            cmd = [
+                'ffmpeg', '-threads', '0', '-loglevel', 'error',
+                '-fflags', '+fastseek', '-i', video_path,
+                '-map', '0:a:0?',  # First audio stream only
+                '-vn', '-dn', '-sn',  # Skip video/data/subtitle streams
+                '-f', 's16le',  # Raw PCM to stdout
+                '-acodec', 'pcm_s16le',
+                '-ar', '16000',
+                '-ac', '1',
+                '-'
+            ]
+
+            # Preallocate from the probed duration so PCM streams straight
+            # into the target array instead of an intermediate bytes object -
+            # that copy is hundreds of MB on multi-hour recordings
+            duration = self._get_media_duration(video_path)
+
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE, bufsize=1 << 20)
+
+            if duration:
+                # Drain stderr on a side thread (as communicate() does) so
+                # ffmpeg can never block on a full stderr pipe - and hang the
+                # stdout loop below - when a bad input floods decode errors
+                stderr_chunks = []
+                stderr_thread = threading.Thread(
+                    target=lambda: stderr_chunks.append(proc.stderr.read()))
+                stderr_thread.start()
+
+                # One second of headroom for duration rounding
+                buf = np.empty(int(duration * 16000) + 16000, dtype=np.int16)
+                view = memoryview(buf).cast('B')
+                total = 0
+                while total < len(view):
+                    n = proc.stdout.readinto(view[total:])
+                    if not n:
+                        break
+                    total += n
+                # Drain anything past the estimate, then collect stderr
+                extra = proc.stdout.read()
+                proc.wait()
+                stderr_thread.join()
+                stderr = b"".join(stderr_chunks)
+                pcm = buf[:total // 2]
+                if extra:
+                    extra = extra[:len(extra) - (len(extra) % 2)]
+                    pcm = np.concatenate([pcm, np.frombuffer(extra, dtype=np.int16)])
+            else:
+                raw, stderr = proc.communicate()
+                pcm = np.frombuffer(raw, dtype=np.int16)
+
+            if proc.returncode != 0 or len(pcm) == 0:
+                print(f"Error extracting audio: {stderr.decode(errors='replace')}")
+                return None
+
+            # Multiply by the reciprocal - elementwise float division is the
+            # slower SIMD path and this array can be huge
+            audio = pcm.astype(np.float32) * np.float32(1.0 / 32768.0)
+            print(f"Audio extracted: {len(audio) / 16000:.2f} seconds")
+            return audio
+
+        except Exception as e:
+            print(f"Error extracting audio: {e}")
+            return None
+
+    def _warm_whisper_model(self):
+        """Preload the faster-whisper model so transcription starts immediately."""
+        try:
+            self._get_whisper_model('faster-whisper', self.whisper_model_size)
+        except Exception:
+            pass  # transcribe_audio handles fallback backends itself
+
+    def _warm_elevenlabs(self):
+        """Prime the ElevenLabs HTTPS connection (DNS + TLS) ahead of synthesis."""
+        if not self.elevenlabs_api_key:
+            return
+        module = self._get_elevenlabs()
+        if module is None:
+            return
+        try:
+            module.voices()
+        except Exception:
+            pass
+
+    def _build_transcript_data(self, segments, on_segment=None) -> dict:
+        """Build the transcript dict from faster-whisper segment objects.
+
+        faster-whisper yields segments lazily, so an on_segment callback
+        fires during decoding - callers can start downstream work (e.g.
+        dispatching TTS per sentence) before transcription finishes.
+        """
+        transcript_data = {
+            'full_text': '',
+            'segments': [],
+            'total_duration': 0
+        }
+
+        # Collect texts in a list and join once - repeated += on a str
+        # reallocates quadratically over long transcripts
+        texts = []
+        for segment in segments:
+            text = segment.text.strip()
+            segment_dict = {
+                'text': text,
+                'start': segment.start,
+                'end': segment.end,
+                'duration': segment.end - segment.start
             }
-            
-            for segment in segments:
-                transcript_data['segments'].append({
-                    'text': segment.text.strip(),
-                    'start': segment.start,
-                    'end': segment.end,
-                    'duration': segment.end - segment.start
-                })
-                transcript_data['full_text'] += segment.text + " "
-                transcript_data['total_duration'] = max(transcript_data['total_duration'], segment.end)
-            
-            transcript_data['full_text'] = transcript_data['full_text'].strip()
-            
+            transcript_data['segments'].append(segment_dict)
+            texts.append(text)
+            if on_segment is not None:
+                on_segment(segment_dict)
+
+        transcript_data['full_text'] = " ".join(texts)
+        # Segments arrive in chronological order, so the last end time is the total
+        if transcript_data['segments']:
+            transcript_data['total_duration'] = transcript_data['segments'][-1]['end']
+        return transcript_data
+
+    def transcribe_audio(self, audio_path, on_segment=None) -> Optional[dict]:
+        """Transcribe audio to text with timing information using whisper.
+
+        Accepts either a file path or a 16 kHz mono float32 numpy array
+        (as produced by extract_audio_array). An optional on_segment
+        callback receives each segment dict as it is decoded, letting
+        callers overlap downstream work with the remaining transcription.
+        """
+        # Try faster-whisper first (more compatible)
+        try:
+            device, compute_type = self._resolve_device_and_compute()
+            print(f"Using faster-whisper for transcription ({device}, {compute_type})...")
+            model = self._get_whisper_model('faster-whisper', self.whisper_model_size)
+            # VAD strips silent regions before inference, so Whisper doesn't
+            # burn decode time (or hallucinate) on pauses in the recording.
+            segments, info = model.transcribe(
+                audio_path, beam_size=self.beam_size,
+                vad_filter=True,
+                vad_parameters=dict(min_silence_duration_ms=500),
+                condition_on_previous_text=False
+            )
+            print(f"Detected language: {info.language} (probability {info.language_probability:.2f})")
+
+            transcript_data = self._build_transcript_data(segments, on_segment)
+
             if transcript_data['full_text']:
                 print(f"Transcription: {transcript_data['full_text']}")
                 print(f"Found {len(transcript_data['segments'])} segments over {transcript_data['total_duration']:.2f} seconds")
@@ -133,10 +441,14 @@ class VideoVoiceChanger:
         
         # Fallback to openai-whisper with timing
         try:
-            import whisper
             print("Using openai-whisper for transcription...")
-            
-            model = whisper.load_model("base")
+
+            # distil-* checkpoints exist only for faster-whisper; this
+            # fallback backend uses base instead
+            model_size = self.whisper_model_size
+            if model_size.startswith('distil-'):
+                model_size = 'base'
+            model = self._get_whisper_model('openai-whisper', model_size)
             result = model.transcribe(audio_path)
             
             transcript_data = {
@@ -146,13 +458,18 @@ class VideoVoiceChanger:
             }
             
             for segment in result['segments']:
-                transcript_data['segments'].append({
+                segment_dict = {
                     'text': segment['text'].strip(),
                     'start': segment['start'],
                     'end': segment['end'],
                     'duration': segment['end'] - segment['start']
-                })
-                transcript_data['total_duration'] = max(transcript_data['total_duration'], segment['end'])
+                }
+                transcript_data['segments'].append(segment_dict)
+                if on_segment is not None:
+                    on_segment(segment_dict)
+            # Segments arrive in chronological order, so the last end time is the total
+            if transcript_data['segments']:
+                transcript_data['total_duration'] = transcript_data['segments'][-1]['end']
             
             if transcript_data['full_text']:
                 print(f"Transcription: {transcript_data['full_text']}")
@@ -184,19 +501,23 @@ class VideoVoiceChanger:
             }
         return None
     
+    def _probe(self, media_path: str) -> Optional[dict]:
+        """Get cached ffprobe format + stream info for a media file."""
+        try:
+            mtime = os.path.getmtime(media_path)
+        except OSError:
+            return None
+        return _ffprobe(media_path, mtime)
+
     def _get_video_info(self, video_path: str) -> dict:
         """Get detailed video information including frame rate."""
         try:
-            cmd = [
-                'ffprobe', '-v', 'quiet', '-print_format', 'json',
-                '-show_streams', '-select_streams', 'v:0', video_path
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                import json
-                data = json.loads(result.stdout)
-                if data.get('streams'):
-                    stream = data['streams'][0]
+            data = self._probe(video_path)
+            if data:
+                streams = [s for s in data.get('streams', [])
+                           if s.get('codec_type') == 'video']
+                if streams:
+                    stream = streams[0]
                     # Parse frame rate
                     fps_str = stream.get('r_frame_rate', '30/1')
                     if '/' in fps_str:
@@ -204,7 +525,7 @@ class VideoVoiceChanger:
                         fps = float(num) / float(den)
                     else:
                         fps = float(fps_str)
-                    
+
                     return {
                         'fps': fps,
                         'width': stream.get('width'),
@@ -214,9 +535,42 @@ class VideoVoiceChanger:
                     }
         except Exception as e:
             print(f"Could not get video info: {e}")
-        
+
         return {'fps': 30.0}  # Default fallback
 
+    def _pick_h264_encoder(self) -> str:
+        """Pick the fastest available H.264 encoder, preferring hardware.
+
+        Hardware encoders (VideoToolbox on macOS, NVENC, QSV) run 5-10x
+        faster than x264 at comparable quality for this use case. Probed
+        once via `ffmpeg -encoders` and cached for the process lifetime.
+        """
+        if VideoVoiceChanger._h264_encoder is None:
+            available = ''
+            try:
+                result = _run(['ffmpeg', '-hide_banner', '-encoders'])
+                if result.returncode == 0:
+                    available = result.stdout
+            except Exception:
+                pass
+
+            VideoVoiceChanger._h264_encoder = 'libx264'
+            for encoder in ('h264_videotoolbox', 'h264_nvenc', 'h264_qsv'):
+                if encoder not in available:
+                    continue
+                # Listed only means compiled in - nvenc shows up on GPU-less
+                # hosts too. Confirm with a one-frame test encode before
+                # committing the real job to it.
+                test = _run([
+                    'ffmpeg', '-hide_banner', '-loglevel', 'error',
+                    '-f', 'lavfi', '-i', 'color=black:size=128x128:rate=30',
+                    '-frames:v', '1', '-c:v', encoder, '-f', 'null', '-'
+                ])
+                if test.returncode == 0:
+                    VideoVoiceChanger._h264_encoder = encoder
+                    break
+        return VideoVoiceChanger._h264_encoder
+
     def _adjust_video_speed_with_itsscale(self, video_path: str, audio_path: str, transcript_data: dict, output_path: str, max_speed_ratio: float = 2.5) -> bool:
         """Speed up video using itsscale method (filter-free, universally compatible)."""
         try:
@@ -244,24 +598,37 @@ class VideoVoiceChanger:
                 speed_ratio = max_speed_ratio
                 print(f"⚠️  Limiting speed ratio to {max_speed_ratio:.1f}x (maximum speedup)")
             
+            # A <1% speed change is imperceptible - skip the whole video
+            # re-encode and just stream-copy with the new audio muxed in
+            if abs(speed_ratio - 1.0) < 0.01:
+                print("Timing already matches (within 1%) - stream-copying video without re-encode")
+                return self.replace_audio_in_video(video_path, audio_path, output_path, original_duration,
+                                                   audio_duration=audio_duration)
+
             print(f"Applying video speed ratio: {speed_ratio:.2f}x")
-            
+
             # Calculate itsscale value (inverse of speed ratio)
             itsscale_value = 1.0 / speed_ratio
             
             # Build ffmpeg command with itsscale (filter-free approach)
+            encoder = self._pick_h264_encoder()
             cmd = [
-                'ffmpeg', 
+                'ffmpeg',
                 '-itsscale', str(itsscale_value), '-i', video_path,  # Scale video timing
                 '-i', audio_path,  # AI audio
-                '-c:v', 'libx264',  # Re-encode video (required when using itsscale)
+                '-c:v', encoder,    # Re-encode video (required when using itsscale)
+            ]
+            if encoder != 'libx264':
+                # Hardware encoders are bitrate-driven rather than CRF-driven
+                cmd.extend(['-b:v', '4M'])
+            cmd.extend([
                 '-c:a', 'aac',      # Re-encode audio to AAC
                 '-profile:v', 'baseline',  # Compatible profile
                 '-pix_fmt', 'yuv420p',     # Compatible pixel format
                 '-movflags', '+faststart', # Optimize for streaming
                 '-map', '0:v:0',    # Use video from first input
                 '-map', '1:a:0',    # Use audio from second input
-            ]
+            ])
             
             # Handle audio duration vs video duration
             final_video_duration = video_duration / speed_ratio
@@ -285,7 +652,7 @@ class VideoVoiceChanger:
             
             print("Processing video with speed adjustment...")
             print(f"🔧 Command: ffmpeg -itsscale {itsscale_value:.3f} [video] + [audio] -> {output_path}")
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = _run(cmd)
             if result.returncode != 0:
                 print(f"Error processing video: {result.stderr}")
                 return False
@@ -308,15 +675,16 @@ class VideoVoiceChanger:
     
     def generate_ai_voice_with_timing(self, transcript_data: dict, voice_id: str = "UgBBYS2sOqTuMpoF3BR0", output_path: str = None) -> Optional[str]:
         """Generate AI voice with natural timing (no stretching)."""
-        if not ELEVENLABS_AVAILABLE:
+        elevenlabs = self._get_elevenlabs()
+        if elevenlabs is None:
             print("ElevenLabs package not available. Please install with: pip install elevenlabs")
             return None
-        
+
         if not self.elevenlabs_api_key:
             print("ElevenLabs API key not provided.")
             print("Add ELEVEN_LABS_KEY to your .env file or get one from: https://elevenlabs.io/")
             return None
-        
+
         try:
             print(f"Generating AI voice for: {transcript_data['full_text'][:50]}...")
             
@@ -324,19 +692,27 @@ class VideoVoiceChanger:
             enhanced_text = self._create_natural_text(transcript_data)
             print("Created natural text with appropriate pauses")
             
-            # Generate audio with enhanced text
-            audio = generate(
+            # Generate audio with enhanced text, streamed so network transfer
+            # overlaps the disk write instead of blocking on full synthesis
+            audio_stream = elevenlabs.generate(
                 text=enhanced_text,
                 voice=voice_id,
-                model="eleven_monolingual_v1"
+                model="eleven_monolingual_v1",
+                stream=True
             )
-            
+
             # Save to file
             if output_path is None:
                 output_path = tempfile.mktemp(suffix='.mp3')
-            
+
             with open(output_path, 'wb') as f:
-                f.write(audio)
+                if isinstance(audio_stream, (bytes, bytearray)):
+                    # Older clients may ignore stream=True and return bytes
+                    f.write(audio_stream)
+                else:
+                    for chunk in audio_stream:
+                        if chunk:
+                            f.write(chunk)
             
             print(f"AI voice generated: {output_path}")
             
@@ -347,52 +723,296 @@ class VideoVoiceChanger:
             print(f"Error generating AI voice: {e}")
             return None
     
+    def _tts_with_timestamps(self, text: str, voice_id: str):
+        """Call the ElevenLabs with-timestamps endpoint directly.
+
+        Returns (audio_bytes, alignment), where alignment maps characters
+        to start/end seconds, or None when requests is unavailable or the
+        call fails (callers fall back to the regular client). The
+        timestamps give the speech duration without probing the generated
+        clip, which re-timing uses to spot segments that overrun their slot.
+        """
+        try:
+            import requests
+        except ImportError:
+            return None
+
+        try:
+            response = requests.post(
+                f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}/with-timestamps",
+                headers={"xi-api-key": self.elevenlabs_api_key},
+                json={"text": text, "model_id": "eleven_monolingual_v1"},
+                timeout=120
+            )
+            if response.status_code != 200:
+                print(f"ElevenLabs with-timestamps request failed ({response.status_code})")
+                return None
+
+            payload = response.json()
+            import base64
+            audio = base64.b64decode(payload["audio_base64"])
+            return audio, payload.get("alignment")
+
+        except Exception as e:
+            print(f"Error calling with-timestamps endpoint: {e}")
+            return None
+
+    def generate_ai_voice_per_segment(self, transcript_data: dict, voice_id: str = "UgBBYS2sOqTuMpoF3BR0", output_path: str = None, max_workers: int = 4) -> Optional[str]:
+        """Generate AI voice segment by segment, preserving original timing.
+
+        Each transcript segment becomes its own TTS request, fired in
+        parallel (bounded by max_workers, which also bounds pressure on the
+        API rate limit). Every clip is then padded with silence to the
+        segment's original duration and the pieces are concatenated with
+        ffmpeg's concat demuxer. Compared to one monolithic generation this
+        keeps timing locally aligned with the video and overlaps the
+        network latency of the individual requests.
+        """
+        elevenlabs = self._get_elevenlabs()
+        if elevenlabs is None:
+            print("ElevenLabs package not available. Please install with: pip install elevenlabs")
+            return None
+
+        if not self.elevenlabs_api_key:
+            print("ElevenLabs API key not provided.")
+            print("Add ELEVEN_LABS_KEY to your .env file or get one from: https://elevenlabs.io/")
+            return None
+
+        segments = transcript_data.get('segments') or []
+        if len(segments) < 2:
+            # Nothing to align per segment - use the single-request path
+            return self.generate_ai_voice_with_timing(transcript_data, voice_id, output_path)
+
+        def synthesize(segment):
+            # Prefer the with-timestamps endpoint: the alignment tells us the
+            # speech duration without probing the clip, which the pad loop
+            # uses to detect slot overruns
+            timed = self._tts_with_timestamps(segment['text'], voice_id)
+            if timed is not None:
+                audio, alignment = timed
+                speech_duration = None
+                end_times = (alignment or {}).get('character_end_times_seconds')
+                if end_times:
+                    speech_duration = end_times[-1]
+                return audio, speech_duration
+
+            audio = elevenlabs.generate(
+                text=segment['text'],
+                voice=voice_id,
+                model="eleven_monolingual_v1"
+            )
+            if not isinstance(audio, (bytes, bytearray)):
+                audio = b"".join(audio)
+            return audio, None
+
+        try:
+            print(f"Generating AI voice for {len(segments)} segments in parallel...")
+            with tempfile.TemporaryDirectory() as temp_dir:
+                with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    audio_clips = list(pool.map(synthesize, segments))
+
+                padded_paths = []
+
+                # The first segment rarely starts at t=0 (VAD trims leading
+                # silence), so open with that much silence or every segment
+                # plays early by the lead-in
+                lead_in = segments[0]['start']
+                if lead_in > 0.05:
+                    silence_path = os.path.join(temp_dir, "lead_in.mp3")
+                    result = _run([
+                        'ffmpeg', '-f', 'lavfi',
+                        '-i', 'anullsrc=r=44100:cl=mono',
+                        '-t', f"{lead_in:.3f}", '-y', silence_path
+                    ])
+                    if result.returncode != 0:
+                        print(f"Error generating lead-in silence: {result.stderr}")
+                        return None
+                    padded_paths.append(silence_path)
+                    accumulated = self._get_media_duration(silence_path) or lead_in
+                else:
+                    accumulated = 0.0
+
+                # Stitch on an absolute timeline: each clip is padded (and
+                # tempo-compressed when it overruns) so the running output
+                # duration lands on the next segment's original start. Sizing
+                # pads against each slot in isolation would let one long clip
+                # push every later segment permanently out of sync.
+                for i, (segment, (clip, speech_duration)) in enumerate(zip(segments, audio_clips)):
+                    raw_path = os.path.join(temp_dir, f"segment_{i}.mp3")
+                    with open(raw_path, 'wb') as f:
+                        f.write(clip)
+
+                    if i + 1 < len(segments):
+                        target = segments[i + 1]['start'] - accumulated
+                    else:
+                        target = segment['end'] - accumulated
+                    # Floor for pathological overruns that already ate the slot
+                    target = max(target, 0.1)
+
+                    clip_duration = speech_duration
+                    if clip_duration is None:
+                        clip_duration = self._get_media_duration(raw_path)
+
+                    filters = []
+                    if clip_duration and clip_duration > target + 0.05:
+                        # AI speech ran past its slot - compress it back in,
+                        # bounded so the voice never audibly races
+                        tempo_filter = self._create_tempo_filter(min(clip_duration / target, 1.5))
+                        if tempo_filter:
+                            filters.append(tempo_filter)
+
+                    # whole_dur pads the decoded samples to an exact total;
+                    # appending pad_dur on top of the clip's real length would
+                    # bake MP3 encoder delay and any trailing silence into
+                    # every segment as a growing bias
+                    filters.append(f"apad=whole_dur={target:.3f}")
+
+                    padded_path = os.path.join(temp_dir, f"segment_{i}_padded.mp3")
+                    result = _run([
+                        'ffmpeg', '-i', raw_path,
+                        '-af', ",".join(filters),
+                        '-y', padded_path
+                    ])
+                    if result.returncode != 0:
+                        print(f"Error padding segment {i}: {result.stderr}")
+                        return None
+                    padded_paths.append(padded_path)
+                    # Advance by what actually landed in the file so any
+                    # remaining error is corrected at the next segment
+                    accumulated += self._get_media_duration(padded_path) or target
+
+                concat_list = os.path.join(temp_dir, "concat.txt")
+                with open(concat_list, 'w') as f:
+                    for path in padded_paths:
+                        f.write(f"file '{path}'\n")
+
+                if output_path is None:
+                    output_path = tempfile.mktemp(suffix='.mp3')
+
+                result = _run([
+                    'ffmpeg', '-f', 'concat', '-safe', '0',
+                    '-i', concat_list, '-c', 'copy', '-y', output_path
+                ])
+                if result.returncode != 0:
+                    print(f"Error concatenating segments: {result.stderr}")
+                    return None
+
+            print(f"AI voice generated: {output_path}")
+            return output_path
+
+        except Exception as e:
+            print(f"Error generating AI voice: {e}")
+            return None
+
+    def _segment_gap_breaks(self, segments) -> list:
+        """Pick a break tag for each gap between consecutive segments.
+
+        Longer silences in the original recording get longer breaks so the
+        AI voice keeps the speaker's pacing. Gaps are bucketed against the
+        module-level threshold table - np.searchsorted over flat start/end
+        arrays classifies every gap at once when numpy is available, with
+        bisect over a plain loop as the fallback. The top bucket (> 2s)
+        interpolates the actual gap length, capped at what ElevenLabs
+        honors, instead of a fixed break.
+        """
+        def to_break(gap, bucket):
+            fragment = _GAP_BREAKS[bucket]
+            if fragment is None:
+                return f' <break time="{min(gap, _GAP_BREAK_MAX):.1f}s"/> '
+            return fragment
+
+        try:
+            import numpy as np
+        except ImportError:
+            gaps = [segments[i + 1]['start'] - segments[i]['end']
+                    for i in range(len(segments) - 1)]
+            return [to_break(gap, bisect.bisect_right(_GAP_THRESHOLDS, gap))
+                    for gap in gaps]
+
+        starts = np.array([s['start'] for s in segments], dtype=np.float32)
+        ends = np.array([s['end'] for s in segments], dtype=np.float32)
+        gaps = starts[1:] - ends[:-1]
+        buckets = np.searchsorted(np.asarray(_GAP_THRESHOLDS), gaps, side='right')
+        return [to_break(gap, bucket) for gap, bucket in zip(gaps.tolist(), buckets.tolist())]
+
     def _create_natural_text(self, transcript_data: dict) -> str:
         """Create text with natural pauses (less aggressive than before)."""
-        import re
-        
-        text = transcript_data['full_text']
-        
-        # Add moderate pauses - much less than before to avoid slow speech
-        text = re.sub(r'([.!?])\s+', r'\1 <break time="0.4s"/> ', text)  # Reduced from 1.2s
-        text = re.sub(r'(,)\s+', r'\1 <break time="0.2s"/> ', text)      # Reduced from 0.6s
-        text = re.sub(r'([;:])\s+', r'\1 <break time="0.3s"/> ', text)   # Reduced from 0.8s
-        
+        segments = transcript_data.get('segments') or []
+        if len(segments) > 1:
+            # Add punctuation pauses per segment and mirror the recording's
+            # inter-segment silences between them
+            gap_breaks = self._segment_gap_breaks(segments)
+            parts = []
+            for i, segment in enumerate(segments):
+                parts.append(_insert_breaks(segment['text'],
+                                            sentence="0.4s", comma="0.2s", semi="0.3s"))
+                if i < len(gap_breaks):
+                    parts.append(gap_breaks[i])
+            text = ''.join(parts)
+        else:
+            # Add moderate pauses - much less than before to avoid slow speech
+            text = _insert_breaks(transcript_data['full_text'],
+                                  sentence="0.4s", comma="0.2s", semi="0.3s")
+
         # Add minimal pauses at start/end
         return f'<break time="0.2s"/> {text} <break time="0.3s"/>'
     
     def list_available_voices(self):
         """List available ElevenLabs voices."""
-        if not ELEVENLABS_AVAILABLE or not self.elevenlabs_api_key:
+        elevenlabs = self._get_elevenlabs()
+        if elevenlabs is None or not self.elevenlabs_api_key:
             print("ElevenLabs not available or API key not set.")
             print("Add ELEVEN_LABS_KEY to your .env file")
             return
-        
+
         try:
-            voice_list = voices()
+            voice_list = elevenlabs.voices()
             print("\nAvailable voices:")
             for voice in voice_list:
                 print(f"- {voice.name}: {voice.voice_id}")
         except Exception as e:
             print(f"Error listing voices: {e}")
     
+    def _get_audio_codec(self, media_path: str) -> Optional[str]:
+        """Get the codec name of the first audio stream, if any."""
+        data = self._probe(media_path)
+        if data:
+            for stream in data.get('streams', []):
+                if stream.get('codec_type') == 'audio':
+                    return stream.get('codec_name')
+        return None
+
     def _get_media_duration(self, media_path: str) -> Optional[float]:
         """Get duration of media file in seconds."""
-        try:
-            cmd = [
-                'ffprobe', '-v', 'quiet', '-show_entries', 'format=duration',
-                '-of', 'csv=p=0', media_path
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                return float(result.stdout.strip())
-        except (ValueError, subprocess.CalledProcessError):
-            pass
+        # For plain audio files mutagen reads the header in-process,
+        # skipping the ffprobe fork entirely. Optional dependency.
+        if media_path.lower().endswith(('.mp3', '.wav', '.m4a')):
+            try:
+                import mutagen
+                audio_file = mutagen.File(media_path)
+                if audio_file is not None and audio_file.info.length:
+                    return float(audio_file.info.length)
+            except ImportError:
+                pass
+            except Exception:
+                pass  # Unparseable header - let ffprobe decide
+
+        data = self._probe(media_path)
+        if data:
+            try:
+                return float(data['format']['duration'])
+            except (KeyError, TypeError, ValueError):
+                pass
         return None
     
     def _create_tempo_filter(self, speed_ratio: float) -> str:
-        """Create an audio tempo filter that can handle any speed ratio."""
-        if speed_ratio == 1.0:
+        """Create an audio tempo filter that can handle any speed ratio.
+
+        Ratios within 2% of 1.0 return no filter at all: the difference is
+        inaudible and skipping the filter lets callers avoid a decode and
+        re-encode pass entirely (exact float equality almost never fired).
+        """
+        if abs(speed_ratio - 1.0) < 0.02:
             return ""
         
         # atempo filter has limits: 0.5 <= tempo <= 2.0
@@ -415,75 +1035,98 @@ class VideoVoiceChanger:
     
     def _add_natural_pauses(self, text: str) -> str:
         """Add natural pause markers to text for more realistic speech timing."""
-        import re
-        
-        # Add pauses after sentences
-        text = re.sub(r'([.!?])\s+', r'\1 <break time="0.8s"/> ', text)
-        
-        # Add shorter pauses after commas
-        text = re.sub(r'(,)\s+', r'\1 <break time="0.3s"/> ', text)
-        
-        # Add pauses after colons and semicolons
-        text = re.sub(r'([;:])\s+', r'\1 <break time="0.5s"/> ', text)
-        
+        text = _insert_breaks(text, sentence="0.8s", comma="0.3s", semi="0.5s")
+
         # Add pause at the beginning and end
-        text = f'<break time="0.5s"/> {text} <break time="0.5s"/>'
-        
-        return text
+        return f'<break time="0.5s"/> {text} <break time="0.5s"/>'
     
-    def replace_audio_in_video(self, video_path: str, new_audio_path: str, output_path: str, original_duration: float = None) -> bool:
-        """Replace audio in video with new audio that's already timed to match."""
+    def replace_audio_in_video(self, video_path: str, new_audio_path: str, output_path: str, original_duration: float = None, tempo_ratio: float = 1.0, audio_duration: float = None) -> bool:
+        """Replace audio in video with new audio that's already timed to match.
+
+        An optional tempo_ratio stretches the audio in the same ffmpeg pass
+        as the mux (fused atempo + pad/trim filter chain), avoiding a
+        separate stretch step with its own MP3 encode/decode round-trip.
+        Callers that already know the generated audio's duration can pass
+        audio_duration to skip re-measuring it.
+        """
         try:
-            # Get durations of both video and audio
-            video_duration = self._get_media_duration(video_path)
-            audio_duration = self._get_media_duration(new_audio_path)
-            
+            # Get durations of both video and audio, preferring values the
+            # caller already has over fresh probes
+            video_duration = self._get_media_duration(video_path) or original_duration
+            if audio_duration is None:
+                audio_duration = self._get_media_duration(new_audio_path)
+
             if video_duration:
                 print(f"Original video duration: {video_duration:.2f} seconds")
             if audio_duration:
                 print(f"Generated audio duration: {audio_duration:.2f} seconds")
-            
-            # Build ffmpeg command
-            cmd = [
-                'ffmpeg', '-i', video_path,
-                '-i', new_audio_path,
-                '-c:v', 'copy',  # Copy video stream
-                '-c:a', 'aac',   # Encode audio as AAC
-                '-map', '0:v:0', # Use video from first input
-                '-map', '1:a:0', # Use audio from second input
-            ]
-            
+
+            # Collect audio filters so tempo and pad/trim run as one chain
+            audio_filters = []
+            use_shortest = False
+            tempo_filter = self._create_tempo_filter(tempo_ratio)
+            if tempo_filter:
+                print(f"Applying audio tempo adjustment: {tempo_ratio:.2f}x")
+                audio_filters.append(tempo_filter)
+                if audio_duration:
+                    audio_duration = audio_duration / tempo_ratio
+
             # Since we've already timed the audio properly, we mainly need to handle
             # cases where there are still small discrepancies
             if video_duration and audio_duration:
                 duration_diff = abs(video_duration - audio_duration)
-                
+
                 if duration_diff > 1.0:
                     print(f"Significant duration difference: {duration_diff:.2f}s - adjusting...")
-                    
+
                     if audio_duration < video_duration:
                         # Audio is shorter - pad it to match video
                         print("Padding audio to match video duration")
-                        audio_filter = f"apad=whole_dur={video_duration}"
-                        cmd.extend(['-af', audio_filter])
+                        audio_filters.append(f"apad=whole_dur={video_duration}")
                     else:
                         # Audio is longer - trim it to match video
                         print("Trimming audio to match video duration")
-                        audio_filter = f"atrim=duration={video_duration}"
-                        cmd.extend(['-af', audio_filter])
+                        audio_filters.append(f"atrim=duration={video_duration}")
                 else:
                     print("Audio and video durations are well matched")
                     # Small difference is acceptable, use shortest to avoid issues
-                    cmd.append('-shortest')
-            else:
+                    use_shortest = True
+            elif not audio_filters:
                 # Fallback: use shortest stream
                 print("Using shortest stream duration")
+                use_shortest = True
+
+            # Filters force a re-encode; otherwise AAC input can be copied
+            # straight into the MP4, making the mux nearly free
+            if audio_filters:
+                audio_codec_args = ['-c:a', 'aac', '-b:a', '128k']
+            elif self._get_audio_codec(new_audio_path) == 'aac':
+                print("AI audio is already AAC - stream-copying without re-encode")
+                audio_codec_args = ['-c:a', 'copy']
+            else:
+                audio_codec_args = ['-c:a', 'aac', '-b:a', '128k']
+
+            # Build ffmpeg command
+            cmd = [
+                'ffmpeg', '-i', video_path,
+                '-i', new_audio_path,
+                '-c:v', 'copy',  # Copy video stream
+            ]
+            cmd.extend(audio_codec_args)
+            cmd.extend([
+                '-movflags', '+faststart',  # Streamable MP4
+                '-map', '0:v:0', # Use video from first input
+                '-map', '1:a:0', # Use audio from second input
+            ])
+            if use_shortest:
                 cmd.append('-shortest')
-            
+            if audio_filters:
+                cmd.extend(['-af', ",".join(audio_filters)])
+
             cmd.extend(['-y', output_path])  # Overwrite output file
             
             print("Processing video with timing-matched audio...")
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = _run(cmd)
             if result.returncode != 0:
                 print(f"Error replacing audio: {result.stderr}")
                 return False
@@ -505,49 +1148,26 @@ class VideoVoiceChanger:
             print(f"Error replacing audio: {e}")
             return False
     
-    def process_video(self, video_path: str, output_path: str = None, voice_id: str = "UgBBYS2sOqTuMpoF3BR0", max_speed_ratio: float = 2.5, adjust_video_speed: bool = True) -> bool:
-        """Complete workflow to process video and change voice."""
-        if not os.path.exists(video_path):
-            print(f"Error: Video file not found: {video_path}")
-            return False
-        
-        if output_path is None:
-            # Save in the same directory as the original video
-            video_path_obj = Path(video_path)
-            base_name = video_path_obj.stem
-            output_path = video_path_obj.parent / f"{base_name}_voice_changed.mp4"
-            output_path = str(output_path)  # Convert back to string
-        
-        print(f"Processing video: {video_path}")
-        print(f"Output will be saved to: {output_path}")
-        if adjust_video_speed:
-            print(f"Maximum video speed adjustment: {max_speed_ratio:.1f}x")
-        else:
-            print("Video speed adjustment disabled - keeping original timing")
-        
-        # Create temporary files
+    def _default_output_path(self, video_path: str) -> str:
+        """Build the default output path next to the original video."""
+        video_path_obj = Path(video_path)
+        base_name = video_path_obj.stem
+        return str(video_path_obj.parent / f"{base_name}_voice_changed.mp4")
+
+    def _render_with_transcript(self, video_path: str, transcript_data: dict, output_path: str, voice_id: str, max_speed_ratio: float, adjust_video_speed: bool, per_segment_tts: bool = False) -> bool:
+        """Generate the AI voice for a transcript and mux it into the video."""
         with tempfile.TemporaryDirectory() as temp_dir:
-            temp_audio = os.path.join(temp_dir, "extracted_audio.wav")
             temp_ai_audio = os.path.join(temp_dir, "ai_voice.mp3")
-            
-            # Step 1: Extract audio
-            print("Step 1: Extracting audio...")
-            if not self.extract_audio(video_path, temp_audio):
-                return False
-            
-            # Step 2: Transcribe audio
-            print("Step 2: Transcribing audio...")
-            transcript_data = self.transcribe_audio(temp_audio)
-            if not transcript_data:
-                print("Error: Could not get transcript")
-                return False
-            
+
             # Step 3: Generate AI voice
             print("Step 3: Generating AI voice...")
-            ai_audio_path = self.generate_ai_voice_with_timing(transcript_data, voice_id, temp_ai_audio)
+            if per_segment_tts:
+                ai_audio_path = self.generate_ai_voice_per_segment(transcript_data, voice_id, temp_ai_audio)
+            else:
+                ai_audio_path = self.generate_ai_voice_with_timing(transcript_data, voice_id, temp_ai_audio)
             if not ai_audio_path:
                 return False
-            
+
             # Step 4: Either adjust video speed or replace audio with original timing
             if adjust_video_speed:
                 print("Step 4: Adjusting video speed to match AI voice...")
@@ -558,10 +1178,121 @@ class VideoVoiceChanger:
                 original_duration = transcript_data.get('total_duration')
                 if not self.replace_audio_in_video(video_path, ai_audio_path, output_path, original_duration):
                     return False
+
+        return True
+
+    def process_video(self, video_path: str, output_path: str = None, voice_id: str = "UgBBYS2sOqTuMpoF3BR0", max_speed_ratio: float = 2.5, adjust_video_speed: bool = True, per_segment_tts: bool = False) -> bool:
+        """Complete workflow to process video and change voice."""
+        if not os.path.exists(video_path):
+            print(f"Error: Video file not found: {video_path}")
+            return False
+
+        if output_path is None:
+            # Save in the same directory as the original video
+            output_path = self._default_output_path(video_path)
+
+        print(f"Processing video: {video_path}")
+        print(f"Output will be saved to: {output_path}")
+        if adjust_video_speed:
+            print(f"Maximum video speed adjustment: {max_speed_ratio:.1f}x")
+        else:
+            print("Video speed adjustment disabled - keeping original timing")
         
+        # Step 1: Extract audio, streamed into memory when numpy is available.
+        # The Whisper model load runs in the background so it overlaps with
+        # ffmpeg instead of extending the critical path. The ElevenLabs
+        # warmup is fire-and-forget on a daemon thread: voices() has no
+        # request timeout in the pinned client, and a stalled endpoint must
+        # never hold up transcription, which is purely local.
+        print("Step 1: Extracting audio...")
+        threading.Thread(target=self._warm_elevenlabs, daemon=True).start()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            model_future = pool.submit(self._warm_whisper_model)
+
+            audio = self.extract_audio_array(video_path)
+            model_future.result()
+
+        if audio is not None:
+            # Step 2: Transcribe audio
+            print("Step 2: Transcribing audio...")
+            transcript_data = self.transcribe_audio(audio)
+        else:
+            # Fallback: extract to a temp WAV, only needed without numpy
+            with tempfile.TemporaryDirectory() as temp_dir:
+                temp_audio = os.path.join(temp_dir, "extracted_audio.wav")
+                if not self.extract_audio(video_path, temp_audio):
+                    return False
+
+                print("Step 2: Transcribing audio...")
+                transcript_data = self.transcribe_audio(temp_audio)
+
+        if not transcript_data:
+            print("Error: Could not get transcript")
+            return False
+
+        # Steps 3-4: Generate AI voice and mux
+        if not self._render_with_transcript(video_path, transcript_data, output_path, voice_id, max_speed_ratio, adjust_video_speed, per_segment_tts):
+            return False
+
         print(f"\n✅ Success! Voice-changed video saved to: {output_path}")
         return True
 
+    def process_videos(self, video_paths, voice_id: str = "UgBBYS2sOqTuMpoF3BR0", max_speed_ratio: float = 2.5, adjust_video_speed: bool = True, batch_size: int = 8) -> list:
+        """Process several videos, batching transcription for throughput.
+
+        Extracts audio for all videos in parallel, then transcribes each
+        through faster-whisper's BatchedInferencePipeline, which decodes
+        several 30s windows per forward pass instead of one at a time.
+        Falls back to sequential process_video calls when batching isn't
+        available. Returns one bool per input video.
+        """
+        video_paths = list(video_paths)
+        faster_whisper = _ensure_faster_whisper()
+        if faster_whisper is None or not hasattr(faster_whisper, 'BatchedInferencePipeline'):
+            print("Batched transcription not available, processing sequentially...")
+            return [self.process_video(path, None, voice_id, max_speed_ratio, adjust_video_speed)
+                    for path in video_paths]
+
+        model = self._get_whisper_model('faster-whisper', self.whisper_model_size)
+        pipeline = faster_whisper.BatchedInferencePipeline(model=model)
+
+        print(f"Extracting audio from {len(video_paths)} videos...")
+        # Fire-and-forget TTS warmup on its own thread - sharing the
+        # extraction pool would make the batch wait on the network call
+        # (and serialize ahead of extraction when the pool has one worker)
+        threading.Thread(target=self._warm_elevenlabs, daemon=True).start()
+        with ThreadPoolExecutor(max_workers=min(4, max(len(video_paths), 1))) as pool:
+            audios = list(pool.map(self.extract_audio_array, video_paths))
+
+        results = []
+        for video_path, audio in zip(video_paths, audios):
+            if audio is None:
+                # Extraction or numpy unavailable - fall back per video
+                results.append(self.process_video(video_path, None, voice_id, max_speed_ratio, adjust_video_speed))
+                continue
+
+            print(f"Transcribing: {video_path}")
+            try:
+                segments, info = pipeline.transcribe(audio, batch_size=batch_size, beam_size=self.beam_size)
+                transcript_data = self._build_transcript_data(segments)
+            except Exception as e:
+                print(f"Error transcribing {video_path}: {e}")
+                results.append(False)
+                continue
+
+            if not transcript_data['full_text']:
+                print(f"Error: Could not get transcript for {video_path}")
+                results.append(False)
+                continue
+
+            output_path = self._default_output_path(video_path)
+            success = self._render_with_transcript(video_path, transcript_data, output_path, voice_id, max_speed_ratio, adjust_video_speed)
+            if success:
+                print(f"\n✅ Success! Voice-changed video saved to: {output_path}")
+            results.append(success)
+
+        return results
+
     def generate_ai_voice(self, text: str, voice_id: str = "UgBBYS2sOqTuMpoF3BR0", output_path: str = None) -> Optional[str]:
         """Generate AI voice using ElevenLabs with natural pauses (backward compatibility)."""
         # Convert text to transcript_data format for natural generation
@@ -587,14 +1318,21 @@ def main():
     parser.add_argument("--api-key", help="ElevenLabs API key (or set ELEVEN_LABS_KEY in .env file)")
     parser.add_argument("--max-speed-ratio", type=float, default=2.5, help="Maximum video speed adjustment (default: 2.5x)")
     parser.add_argument("--no-adjust-video", action="store_true", help="Disable video speed adjustment (use original timing)")
+    parser.add_argument("--per-segment-tts", action="store_true", help="Generate AI voice per transcript segment (parallel requests, preserves original pacing)")
+    parser.add_argument("--whisper-model", default="distil-large-v3", help="Whisper model size (default: distil-large-v3)")
+    parser.add_argument("--beam-size", type=int, default=1, help="Whisper beam size (default: 1, larger is slower)")
+    parser.add_argument("--compute-type", help="Whisper compute type, e.g. auto, int8, float16 (default: int8 on CPU, int8_float16 on GPU)")
     
     args = parser.parse_args()
     
     # Get API key from argument, .env file, or environment
+    if not args.api_key:
+        _load_dotenv_if_needed()
     api_key = args.api_key or os.getenv("ELEVEN_LABS_KEY") or os.getenv("ELEVENLABS_API_KEY")
     
     # Initialize voice changer
-    voice_changer = VideoVoiceChanger(api_key)
+    voice_changer = VideoVoiceChanger(api_key, whisper_model_size=args.whisper_model,
+                                      beam_size=args.beam_size, compute_type=args.compute_type)
     
     # List voices if requested
     if args.list_voices:
@@ -603,7 +1341,7 @@ def main():
     
     # Process video
     if args.video_path:
-        voice_changer.process_video(args.video_path, args.output, args.voice, args.max_speed_ratio, not args.no_adjust_video)
+        voice_changer.process_video(args.video_path, args.output, args.voice, args.max_speed_ratio, not args.no_adjust_video, args.per_segment_tts)
     else:
         print("Usage: python3 voice_changer.py <video_path> [-o output_path] [-v voice_id]")
         print("       python3 voice_changer.py --list-voices")